@@ -1,10 +1,30 @@
 import streamlit as st
 import io
-import sys
 from contextlib import redirect_stdout
 import prop_ev  # import your existing model
+from dvp_updater import load_dvp_data
+from auto_prop_scraper import fetch_prizepicks_props
 
 st.set_page_config(page_title="Prop_EV Analyzer", page_icon="🧠", layout="centered")
+
+
+# --- Cached loaders (Streamlit reruns the whole script per interaction,
+# so anything that touches disk or network gets cached here) ---
+@st.cache_resource
+def get_settings():
+    return prop_ev.load_settings()
+
+
+@st.cache_data(ttl=12 * 3600, show_spinner=False)
+def get_dvp():
+    return load_dvp_data()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def get_props():
+    return fetch_prizepicks_props()
+
+
 st.title("🧠 Prop_EV Analyzer")
 
 st.markdown(
@@ -27,56 +47,35 @@ if run_clicked:
     if player.strip() == "":
         st.warning("Please enter a player name first.")
     else:
-        # Capture model output from console
+        # Call the model directly and read structured fields from the
+        # returned dict — no stdin monkey-patching or output parsing.
         buffer = io.StringIO()
-        sys.stdin = io.StringIO(f"{player}\n{stat}\n{line}\n{odds}\n")
+        res = None
         with redirect_stdout(buffer):
             try:
-                prop_ev.main()
+                res = prop_ev.analyze_single_prop(
+                    player, stat, line, odds, get_settings(), dvp=get_dvp()
+                )
             except Exception as e:
                 print(f"[Error running model] {e}")
         output = buffer.getvalue()
 
-        # --- Parse output for nicer formatting ---
         st.divider()
         st.subheader(f"📊 Results for {player}")
 
-        # Extract key lines
-        lines = output.splitlines()
-        info = {}
-        for line in lines:
-            if "Model Prob" in line:
-                info["Model Prob"] = line.split(":")[-1].strip()
-            elif "Book Prob" in line:
-                info["Book Prob"] = line.split(":")[-1].strip()
-            elif "Model Projection" in line:
-                info["Projection"] = line.split(":")[-1].strip()
-            elif "EV" in line and "per $1" in line:
-                info["EV"] = line.split(":")[-1].strip()
-            elif "Verdict" in line or "Value" in line:
-                info["Verdict"] = line.strip()
-            elif "Games" in line:
-                info["Games"] = line.split(":")[-1].strip()
-
-        # Display clean cards
-        if "Model Prob" in info:
-            st.metric("Model Probability", info["Model Prob"])
-        if "Book Prob" in info:
-            st.metric("Sportsbook Probability", info["Book Prob"])
-        if "Projection" in info:
-            st.metric("Model Projection", info["Projection"])
-        if "EV" in info:
-            st.metric("Expected Value", info["EV"])
-        if "Games" in info:
-            st.caption(f"Games analyzed: {info['Games']}")
-
-        if "Verdict" in info:
-            if "Over" in info["Verdict"]:
-                st.success(info["Verdict"])
-            elif "Under" in info["Verdict"]:
-                st.error(info["Verdict"])
+        if res is None:
+            st.error(f"Could not analyze {player} — check the console log below.")
+        else:
+            st.metric("Model Probability", f"{res['p_model']*100:.1f}%")
+            st.metric("Sportsbook Probability", f"{res['p_book']*100:.1f}%")
+            st.metric("Model Projection", f"{res['projection']:.1f} {stat}")
+            st.metric("Expected Value", f"{res['ev']*100:.1f}¢ per $1")
+            st.caption(f"Games analyzed: {res['n_games']}")
+
+            if res["direction"] == "OVER":
+                st.success("🟢 Over Value")
             else:
-                st.info(info["Verdict"])
+                st.error("🔴 Under Value")
 
         st.divider()
         with st.expander("📜 Full Console Output"):
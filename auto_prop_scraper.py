@@ -5,12 +5,57 @@
 # runs PropPulse+ analysis, and exports results to Excel.
 # ===============================================================
 
-import os, time, json, requests, pandas as pd
+import os, time, json, asyncio, orjson, requests, numpy as np, pandas as pd
 from datetime import datetime
-from prop_ev import analyze_single_prop, load_settings
-from openpyxl import load_workbook
-from openpyxl.styles import PatternFill
-from openpyxl.utils import get_column_letter
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from prop_ev import analyze_single_prop, analyze_single_prop_cached, load_settings
+from xlsxwriter.utility import xl_rowcol_to_cell
+
+
+# ===============================================================
+# 🌐 Shared HTTP Session (keep-alive + retries)
+# ===============================================================
+# One pooled session for every outbound call — reuses TCP/TLS connections
+# instead of paying the handshake cost on each of hundreds of requests.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3,
+                      status_forcelist=[429, 500, 502, 503, 504]),
+))
+
+
+# ===============================================================
+# 🎛️ PrizePicks Filter Constants
+# ===============================================================
+# Hoisted to module scope so the per-projection loop doesn't rebuild
+# them on every iteration (~500 projections per fetch)
+_SKIP_KW = ("GOBLIN", "DEMON", "FLASH", "SPECIAL", "BOOST")
+_BAD_KW = ("COMBO", "FANTASY", "TURNOVER", "1ST", "HALF", "BLOCK", "STEAL",
+           "SCORE", "TO", "DEF", "BLK", "STL")
+_BAD_NAMES_LOWER = tuple(n.lower() for n in [
+    "A.J. Green", "Two-Way", "Unsigned", "Inactive", "Exhibit 10",
+    "G League", "TBD", "Test"
+])
+_ALLOWED_STATS = frozenset({"PTS", "REB", "AST", "PRA", "PR", "PA", "REB+AST", "FG3M"})
+_STAT_MAP = {
+    "POINTS": "PTS",
+    "REBOUNDS": "REB",
+    "ASSISTS": "AST",
+
+    # Combined props
+    "PTS+REB+AST": "PRA",
+    "PTS+REB": "PR",          # NEW
+    "PTS+AST": "PA",          # NEW
+    "REB+AST": "REB+AST",
+
+    # Threes
+    "THREES": "FG3M",
+    "3-PT MADE": "FG3M",
+}
 
 
 # ===============================================================
@@ -34,9 +79,9 @@ def fetch_prizepicks_props():
 
     print("[PrizePicks] 🔄 Fetching live NBA projections...")
     try:
-        r = requests.get(url, params=params, headers=headers, timeout=15)
+        r = SESSION.get(url, params=params, headers=headers, timeout=15)
         r.raise_for_status()
-        data = r.json()
+        data = orjson.loads(r.content)  # 2-3x faster than stdlib json on this payload
         total_props = len(data.get('data', []))
         print(f"[PrizePicks] ✅ Response OK — {total_props} props found.")
         
@@ -48,7 +93,9 @@ def fetch_prizepicks_props():
         print(f"[PrizePicks] ❌ Error fetching props: {e}")
         return []
 
-    props = []
+    # Struct-of-arrays: one list per column, turned into a DataFrame in a
+    # single pass instead of allocating a dict per prop
+    players, stats, lines = [], [], []
     included = {i["id"]: i for i in data.get("included", [])}
     
     # Debug counters
@@ -69,28 +116,38 @@ def fetch_prizepicks_props():
         player_rel = rel.get("new_player", {}).get("data", {})
         player_id = player_rel.get("id")
 
+        # League filtering first — league_id is the cheapest discriminator,
+        # so non-NBA rows skip all the attribute/keyword work below. The
+        # league-name heuristic stays as a fallback for payloads without ids.
+        if attrs.get("league_id") != 7:
+            league_name = (
+                attrs.get("league", "")
+                or attrs.get("league_name", "")
+                or included.get(player_id, {}).get("attributes", {}).get("league", "")
+            ).upper()
+            if "NBA" not in league_name:
+                filtered_counts["non_nba"] += 1
+                continue
+
         # ⚠️ CRITICAL: Filter out non-main boards
-        is_promo = attrs.get("is_promo", False)
-        flash_sale = attrs.get("flash_sale_line_score")
-        description = attrs.get("description", "").upper()
-        odds_type = attrs.get("odds_type", "").upper()
-        
-        # Skip promotional/flash sale lines
-        if is_promo:
+        # Cheapest rejects first — only uppercase the description/odds
+        # strings for rows that survive the flag checks
+        if attrs.get("is_promo", False):
             filtered_counts["promo"] += 1
             continue
-        if flash_sale:
+        if attrs.get("flash_sale_line_score"):
             filtered_counts["flash_sale"] += 1
             continue
-        
+
         # Skip boards with special modifiers in description
-        skip_keywords = ["GOBLIN", "DEMON", "FLASH", "SPECIAL", "BOOST"]
-        if any(kw in description for kw in skip_keywords):
+        description = attrs.get("description", "").upper()
+        if any(kw in description for kw in _SKIP_KW):
             filtered_counts["special_desc"] += 1
             continue
-        
+
         # Skip non-standard odds types (e.g., boosted odds)
-        if odds_type and odds_type not in ["", "STANDARD", "NORMAL"]:
+        odds_type = attrs.get("odds_type", "").upper()
+        if odds_type and odds_type not in ("STANDARD", "NORMAL"):
             continue
 
         player_data = included.get(player_id, {}).get("attributes", {})
@@ -98,65 +155,30 @@ def fetch_prizepicks_props():
         stat_type = attrs.get("stat_type", "").upper()
         line_score = attrs.get("line_score", 0)
 
-        # League filtering
-        league_name = (
-            attrs.get("league", "")
-            or attrs.get("league_name", "")
-            or included.get(player_id, {}).get("attributes", {}).get("league", "")
-        ).upper()
-        if "NBA" not in league_name and attrs.get("league_id") != 7:
-            filtered_counts["non_nba"] += 1
-            continue
-
         # Stat type mapping
-        stat_map = {
-    "POINTS": "PTS",
-    "REBOUNDS": "REB",
-    "ASSISTS": "AST",
-
-    # Combined props
-    "PTS+REB+AST": "PRA",
-    "PTS+REB": "PR",          # NEW
-    "PTS+AST": "PA",          # NEW
-    "REB+AST": "REB+AST",
-
-    # Threes
-    "THREES": "FG3M",
-    "3-PT MADE": "FG3M",
-}
-
-        stat = stat_map.get(stat_type, stat_type)
+        stat = _STAT_MAP.get(stat_type, stat_type)
 
         # Only allow main stat types
-        allowed = {"PTS", "REB", "AST", "PRA", "PR", "PA", "REB+AST", "FG3M"}
-        if stat not in allowed:
+        if stat not in _ALLOWED_STATS:
             continue
 
         # Filter out unwanted prop types
-        bad_keywords = [
-            "COMBO", "FANTASY", "TURNOVER", "1ST", "HALF", "BLOCK", "STEAL",
-            "SCORE", "TO", "DEF", "BLK", "STL"
-        ]
-        if any(b in stat_type for b in bad_keywords):
+        if any(b in stat_type for b in _BAD_KW):
             continue
 
         # Hard filters for invalid players
-        bad_names = ["A.J. Green", "Two-Way", "Unsigned", "Inactive", "Exhibit 10", "G League", "TBD", "Test"]
         if (
             line_score == 0
             or not player_name
             or player_name.strip() == ""
-            or any(bad.lower() in player_name.lower() for bad in bad_names)
+            or any(bad in player_name.lower() for bad in _BAD_NAMES_LOWER)
         ):
             filtered_counts["bad_player"] += 1
             continue
 
-        props.append({
-            "player": player_name,
-            "stat": stat,
-            "line": float(line_score),
-            "odds": -110
-        })
+        players.append(player_name)
+        stats.append(stat)
+        lines.append(float(line_score))
 
     # Print filter statistics
     print(f"[Filter Stats] Processed: {filtered_counts['total_processed']}")
@@ -166,43 +188,46 @@ def fetch_prizepicks_props():
     print(f"  ├─ Non-NBA: {filtered_counts['non_nba']}")
     print(f"  ├─ Bad Stat: {filtered_counts['bad_stat']}")
     print(f"  ├─ Bad Player: {filtered_counts['bad_player']}")
-    print(f"  └─ Kept: {len(props)}")
-    print(f"[PrizePicks] 🔍 Initial filter: {len(props)} valid NBA props")
+    print(f"  └─ Kept: {len(players)}")
+    print(f"[PrizePicks] 🔍 Initial filter: {len(players)} valid NBA props")
 
     # ===============================================================
     # 🎯 Smart Deduplication (Keep Main Board Lines Only)
     # ===============================================================
-    if not props:
+    if not players:
         return []
 
-    df = pd.DataFrame(props)
-    
-    # Additional filtering: Remove extreme outliers that suggest alt boards
-    def is_likely_main_board(row):
-        stat, line = row["stat"], row["line"]
-        
-        # Extreme lines are usually alternates
-        outlier_thresholds = {
-            "PTS": (line < 3 or line > 50),
-            "REB": (line < 0.5 or line > 25),
-            "AST": (line < 0.5 or line > 18),
-            "PRA": (line < 8 or line > 65),
-            "REB+AST": (line < 1 or line > 30),
-            "FG3M": (line < 0.5 or line > 8)
-        }
-        
-        if stat in outlier_thresholds and outlier_thresholds[stat]:
-            return False
-        
-        # Half-point lines in assists/rebounds under 2 are usually gimmicks
-        if stat in ["AST", "REB", "FG3M"] and line < 2.0 and (line % 1 == 0.5):
-            return False
-            
-        return True
-    
-    df = df[df.apply(is_likely_main_board, axis=1)]
+    df = pd.DataFrame({
+        "player": players,
+        "stat": stats,
+        "line": np.asarray(lines, dtype=np.float32),
+        "odds": np.full(len(players), -110, dtype=np.int16),
+    })
+
+    # Additional filtering: Remove extreme outliers that suggest alt boards.
+    # Vectorized boolean masks instead of df.apply — one C-level pass
+    # over the whole board rather than a Python call per row.
+    outlier_thresholds = {
+        "PTS": (3, 50),
+        "REB": (0.5, 25),
+        "AST": (0.5, 18),
+        "PRA": (8, 65),
+        "REB+AST": (1, 30),
+        "FG3M": (0.5, 8)
+    }
+
+    stat = df["stat"]
+    line = df["line"]
+    min_s = stat.map({k: v[0] for k, v in outlier_thresholds.items()})
+    max_s = stat.map({k: v[1] for k, v in outlier_thresholds.items()})
+    in_range = ((line >= min_s) & (line <= max_s)) | min_s.isna()
+
+    # Half-point lines in assists/rebounds under 2 are usually gimmicks
+    gimmick = stat.isin(["AST", "REB", "FG3M"]) & (line < 2.0) & ((line % 1) == 0.5)
+
+    df = df[in_range & ~gimmick]
     print(f"[Filter] 🚫 Removed extreme outliers: {len(df)} props remain")
-    
+
     # Define realistic line ranges for each stat type (main board thresholds)
     line_ranges = {
     "PTS": (5, 45),
@@ -215,75 +240,54 @@ def fetch_prizepicks_props():
     "FG3M": (0.5, 7)
 }
 
-    
-    # Filter to realistic ranges first
-    def is_main_board_line(row):
-        stat = row["stat"]
-        line = row["line"]
-        if stat in line_ranges:
-            min_val, max_val = line_ranges[stat]
-            return min_val <= line <= max_val
-        return True
-    
-    df = df[df.apply(is_main_board_line, axis=1)]
+    # Filter to realistic ranges first — same mask pattern as above
+    stat = df["stat"]
+    line = df["line"]
+    min_s = stat.map({k: v[0] for k, v in line_ranges.items()})
+    max_s = stat.map({k: v[1] for k, v in line_ranges.items()})
+    df = df[((line >= min_s) & (line <= max_s)) | min_s.isna()]
     print(f"[Filter] 📏 Filtered to realistic line ranges: {len(df)} props")
     
-    # Group by player+stat and pick the most common line (mode)
-    def select_main_line(group):
-        if len(group) == 1:
-            return group.iloc[0]
-        
-        # Get the most frequently occurring line (mode)
-        line_counts = group["line"].value_counts()
-        most_common_line = line_counts.index[0]
-        max_count = line_counts.iloc[0]
-        
-        # Strong preference: line that appears multiple times
-        if max_count >= 2:
-            return group[group["line"] == most_common_line].iloc[0]
-        
-        # If all unique, look for "typical" main board values
-        stat = group["stat"].iloc[0]
-        lines = sorted(group["line"].values)
-        
-        # Main board lines cluster around typical values
-        # Pick line closest to these common thresholds
-        typical_values = {
-            "PTS": [10.5, 12.5, 14.5, 16.5, 18.5, 20.5, 22.5, 25.5, 28.5, 30.5],
-            "REB": [3.5, 4.5, 5.5, 6.5, 7.5, 8.5, 9.5, 10.5],
-            "AST": [2.5, 3.5, 4.5, 5.5, 6.5, 7.5, 8.5],
-            "PRA": [18.5, 20.5, 22.5, 25.5, 28.5, 30.5, 35.5],
-            "REB+AST": [4.5, 5.5, 6.5, 7.5, 8.5, 9.5, 10.5],
-            "FG3M": [1.5, 2.5, 3.5, 4.5]
-        }
-
-        if stat in typical_values:
-            targets = typical_values[stat]
-            min_dist = float("inf")
-            best_line = group["line"].iloc[0]
-
-            for line in group["line"]:
-                dist = min(abs(line - t) for t in targets)
-                if dist < min_dist:
-                    min_dist = dist
-                    best_line = line
-
-            return group[group["line"] == best_line].iloc[0]
-
-        # Fallback: pick median
-        median_line = group["line"].median()
-        closest_idx = (group["line"] - median_line).abs().idxmin()
-        return group.loc[closest_idx]
+    # Main board lines cluster around typical values — used to break ties
+    # when every line in a group is unique
+    typical_values = {
+        "PTS": [10.5, 12.5, 14.5, 16.5, 18.5, 20.5, 22.5, 25.5, 28.5, 30.5],
+        "REB": [3.5, 4.5, 5.5, 6.5, 7.5, 8.5, 9.5, 10.5],
+        "AST": [2.5, 3.5, 4.5, 5.5, 6.5, 7.5, 8.5],
+        "PRA": [18.5, 20.5, 22.5, 25.5, 28.5, 30.5, 35.5],
+        "REB+AST": [4.5, 5.5, 6.5, 7.5, 8.5, 9.5, 10.5],
+        "FG3M": [1.5, 2.5, 3.5, 4.5]
+    }
 
     # 🔒 Safety check before deduplication
     if "stat" not in df.columns or "player" not in df.columns:
         print("[ERROR] Missing expected columns in DataFrame. Columns found:", df.columns.tolist())
         return []
 
-    # Apply deduplication
+    # Pick one row per (player, stat) with a single sort + drop_duplicates:
+    # rank candidates by line frequency first (modal line wins), then by
+    # distance to the nearest typical main-board value, falling back to
+    # distance from the group median for stats without typical targets
+    dedup = df.drop_duplicates(["player", "stat", "line"]).copy()
+    counts = df.groupby(["player", "stat", "line"]).size().rename("freq").reset_index()
+    dedup = dedup.merge(counts, on=["player", "stat", "line"])
+
+    typ_df = pd.DataFrame(
+        [(s, t) for s, ts in typical_values.items() for t in ts],
+        columns=["stat", "target"],
+    )
+    exploded = dedup.reset_index().merge(typ_df, on="stat", how="left")
+    exploded["dist"] = (exploded["line"] - exploded["target"]).abs()
+    dedup["min_dist"] = exploded.groupby("index")["dist"].min()
+
+    median_line = dedup.groupby(["player", "stat"])["line"].transform("median")
+    dedup["min_dist"] = dedup["min_dist"].fillna((dedup["line"] - median_line).abs())
+
     result_df = (
-        df.groupby(["player", "stat"], as_index=False, group_keys=False)
-        .apply(select_main_line)
+        dedup.sort_values(["player", "stat", "freq", "min_dist", "line"],
+                          ascending=[True, True, False, True, True])
+        .drop_duplicates(["player", "stat"], keep="first")
+        .drop(columns=["freq", "min_dist"])
         .reset_index(drop=True)
     )
 
@@ -308,40 +312,80 @@ def fetch_prizepicks_props():
 # ===============================================================
 def save_results_excel(df: pd.DataFrame, xlsx_path: str):
     """Write DataFrame to Excel with color-coded projections"""
-    with pd.ExcelWriter(xlsx_path, engine="openpyxl") as writer:
+    with pd.ExcelWriter(xlsx_path, engine="xlsxwriter") as writer:
         df.to_excel(writer, index=False, sheet_name="NBA_PROPS")
 
-    wb = load_workbook(xlsx_path)
-    ws = wb["NBA_PROPS"]
-
-    proj_col, line_col = None, None
-    for c in range(1, ws.max_column + 1):
-        val = str(ws.cell(row=1, column=c).value).lower()
-        if "projection" in val:
-            proj_col = c
-        elif val == "line":
-            line_col = c
-
-    if proj_col and line_col:
-        for row in range(2, ws.max_row + 1):
-            proj = ws.cell(row=row, column=proj_col).value
-            line = ws.cell(row=row, column=line_col).value
-            if proj is None or line is None:
-                continue
+        cols = [str(c).lower() for c in df.columns]
+        proj_col = next((i for i, c in enumerate(cols) if "projection" in c), None)
+        line_col = next((i for i, c in enumerate(cols) if c == "line"), None)
+
+        if proj_col is not None and line_col is not None and len(df) > 0:
+            # One write pass: Excel evaluates the formula rules at render
+            # time, so there's no reopen-and-color loop in Python
+            wb = writer.book
+            ws = writer.sheets["NBA_PROPS"]
+            proj_cell = xl_rowcol_to_cell(1, proj_col, col_abs=True)
+            line_cell = xl_rowcol_to_cell(1, line_col, col_abs=True)
+            neutral = f"MAX(0.2,{line_cell}*0.05)"
+            first_row, last_row = 1, len(df)
+
+            rules = [
+                (f"=ABS({proj_cell}-{line_cell})<={neutral}", "#FFEB9C"),  # yellow
+                (f"=({proj_cell}-{line_cell})>{neutral}", "#C6EFCE"),      # green
+                (f"=({proj_cell}-{line_cell})<-{neutral}", "#FFC7CE"),     # red
+            ]
+            for criteria, color in rules:
+                ws.conditional_format(first_row, proj_col, last_row, proj_col, {
+                    "type": "formula",
+                    "criteria": criteria,
+                    "format": wb.add_format({"bg_color": color}),
+                })
 
-            neutral_zone = max(0.2, line * 0.05)
-            diff = proj - line
-            cell = ws.cell(row=row, column=proj_col)
+    print(f"✅ Excel exported → {xlsx_path}")
 
-            if abs(diff) <= neutral_zone:
-                cell.fill = PatternFill(start_color="FFEB9C", fill_type="solid")  # yellow
-            elif diff > neutral_zone:
-                cell.fill = PatternFill(start_color="C6EFCE", fill_type="solid")  # green
-            else:
-                cell.fill = PatternFill(start_color="FFC7CE", fill_type="solid")  # red
 
-    wb.save(xlsx_path)
-    print(f"✅ Excel exported → {xlsx_path}")
+# ===============================================================
+# ⚡ Per-Prop Worker (runs in thread pool)
+# ===============================================================
+def _clamp_projection(proj, line):
+    """Pull projections more than 2x off the line back toward it (vectorized)."""
+    proj = np.asarray(proj, dtype=np.float64)
+    line = np.asarray(line, dtype=np.float64)
+    out = proj.copy()
+    mask = (proj > 2 * line) | (proj < 0.5 * line)
+    out[mask] = 0.5 * (proj[mask] + line[mask])
+    return out
+
+
+def _run_prop(prop, settings):
+    """Analyze one prop and return its result row (or None on failure)."""
+    player, stat, line, odds = prop["player"], prop["stat"], prop["line"], prop["odds"]
+
+    try:
+        res = analyze_single_prop_cached(player, stat, line, odds, settings)
+        if not res:
+            return None
+
+        return {
+            "Player": player,
+            "Stat": stat,
+            "Line": line,
+            "Odds": odds,
+            "Projection": res.get("projection", 0),
+            "Model Prob": f"{res.get('p_model', 0)*100:.1f}%",
+            "Book Prob": f"{res.get('p_book', 0)*100:.1f}%",
+            "EV¢": res.get("ev", 0) * 100,  # kept numeric; formatted at export
+            "Confidence": f"{res.get('confidence', 0):.2f}",
+            "Grade": res.get("grade", "N/A"),
+            "Result": res.get("result", "⚠️"),
+            "Opponent": res.get("opponent", "N/A"),
+            "Direction": res.get("direction", "N/A"),
+            "DvP Mult": f"{res.get('dvp_mult', 1.0):.3f}",
+            "Games": res.get("n_games", 0)
+        }
+    except Exception as e:
+        print(f" ❌ Error analyzing {player}: {e}")
+        return None
 
 
 # ===============================================================
@@ -358,73 +402,59 @@ def main():
         print("⚠️ No props found — try again later.")
         return
 
-    results = []
     total = len(props)
-    print(f"\n📊 Analyzing {total} props...\n")
-
-    for i, prop in enumerate(props, start=1):
-        player, stat, line, odds = prop["player"], prop["stat"], prop["line"], prop["odds"]
-        print(f"[{i}/{total}] {player} — {stat} {line}")
-
-        try:
-            res = analyze_single_prop(player, stat, line, odds, settings, debug_mode=False)
-            if res:
-                proj = res.get("projection", 0)
-                if proj > line * 2 or proj < line / 2:
-                    proj = (proj + line) / 2  # clamp unrealistic
-
-                results.append({
-                    "Player": player,
-                    "Stat": stat,
-                    "Line": line,
-                    "Odds": odds,
-                    "Projection": proj,
-                    "Model Prob": f"{res.get('p_model', 0)*100:.1f}%",
-                    "Book Prob": f"{res.get('p_book', 0)*100:.1f}%",
-                    "EV¢": f"{res.get('ev', 0)*100:+.1f}",
-                    "Confidence": f"{res.get('confidence', 0):.2f}",
-                    "Grade": res.get("grade", "N/A"),
-                    "Result": res.get("result", "⚠️"),
-                    "Opponent": res.get("opponent", "N/A"),
-                    "Direction": res.get("direction", "N/A"),
-                    "DvP Mult": f"{res.get('dvp_mult', 1.0):.3f}",
-                    "Games": res.get("n_games", 0)
-                })
-        except Exception as e:
-            print(f" ❌ Error analyzing {player}: {e}")
+    print(f"\n📊 Analyzing {total} props concurrently...\n")
 
-        time.sleep(0.2)
+    # Dispatch every prop to a thread pool and overlap the network waits —
+    # analyze_single_prop is I/O-bound, so 16 workers collapse the wall clock
+    # from N*latency to roughly latency*ceil(N/16).
+    loop = asyncio.new_event_loop()
+    try:
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            tasks = [loop.run_in_executor(pool, _run_prop, prop, settings) for prop in props]
+            completed = loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+    finally:
+        loop.close()
+
+    results = [r for r in completed if isinstance(r, dict)]
+    print(f"\n📊 Analyzed {len(results)}/{total} props successfully")
 
     if not results:
         print("⚠️ No successful analyses — check prop data.")
         return
 
     df = pd.DataFrame(results)
-    df["EV_numeric"] = df["EV¢"].astype(str).str.replace("+", "").astype(float)
+
+    # Clamp unrealistic projections in one array pass instead of per row
+    df["Projection"] = _clamp_projection(df["Projection"], df["Line"])
 
     # ===============================================================
     # 🧹 Filter out weak edges
     # ===============================================================
     df["Delta"] = abs(df["Projection"] - df["Line"])
 
-    def is_strong(row):
-        if row["Stat"] in ["PTS", "PRA"]:
-            return row["Delta"] >= 1.0
-        elif row["Stat"] in ["REB", "AST", "REB+AST"]:
-            return row["Delta"] >= 0.8
-        elif row["Stat"] in ["FG3M"]:
-            return row["Delta"] >= 0.5
-        return row["Delta"] >= 1.0
-
-    df = df[df.apply(is_strong, axis=1)]
+    # Minimum projection-vs-line edge per stat type (vectorized mask)
+    strong_thresholds = {
+        "PTS": 1.0,
+        "PRA": 1.0,
+        "REB": 0.8,
+        "AST": 0.8,
+        "REB+AST": 0.8,
+        "FG3M": 0.5
+    }
+    threshold = df["Stat"].map(strong_thresholds).fillna(1.0)
+    df = df[df["Delta"] >= threshold]
     print(f"[Filter] ⚖️ Removed weak edges — {len(df)} strong props remain")
 
     # ===============================================================
     # 🧠 Sort, trim, and export results
     # ===============================================================
-    df = df.sort_values("EV_numeric", ascending=False).drop(columns=["EV_numeric"])
+    df = df.sort_values("EV¢", ascending=False)
     df = df.head(220)
 
+    # EV stays a float until here; format it only for export/display
+    df["EV¢"] = df["EV¢"].map("{:+.1f}".format)
+
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     xlsx_path = f"proppulse_results_{timestamp}.xlsx"
     save_results_excel(df, xlsx_path)
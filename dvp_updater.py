@@ -11,31 +11,54 @@
 #   PTS, REB, AST, FG3M
 
 import os
-import json
+import re
 import time
+import pickle
 import requests
 import pandas as pd
-from bs4 import BeautifulSoup
 from io import StringIO
-
-CACHE_FILE = "data/dvp_cache.json"
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Pooled session with keep-alive + retries so repeat fetches
+# skip the TCP/TLS handshake.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3,
+                      status_forcelist=[429, 500, 502, 503, 504]),
+))
+
+CACHE_FILE = "data/dvp_cache.pkl"
 CACHE_HOURS = 12
 
 HASHTAG_URL = "https://hashtagbasketball.com/nba-defense-vs-position"
 
+# Cells look like "15.6 1" (value then rank) or just a rank —
+# the trailing number is the one we want
+_RANK_RE = re.compile(r"(\d+(?:\.\d+)?)\s*$")
+
 
 # ------------------------------------------------------
 # Team Mapping (abbreviations used on HashtagBasketball)
 # ------------------------------------------------------
-TEAM_MAP = {
-    "ATL": "ATL", "BOS": "BOS", "BKN": "BKN", "CHA": "CHA", "CHI": "CHI",
-    "CLE": "CLE", "DAL": "DAL", "DEN": "DEN", "DET": "DET", "GSW": "GS",
-    "GS": "GSW", "HOU": "HOU", "IND": "IND", "LAC": "LAC", "LAL": "LAL",
-    "MEM": "MEM", "MIA": "MIA", "MIL": "MIL", "MIN": "MIN", "NOP": "NO",
-    "NO": "NOP", "NYK": "NY", "NY": "NYK", "OKC": "OKC", "ORL": "ORL",
-    "PHI": "PHI", "PHX": "PHX", "POR": "POR", "SAC": "SAC", "SAS": "SA",
-    "SA": "SAS", "TOR": "TOR", "UTA": "UTA", "WAS": "WAS"
-}
+POSITIONS = ("PG", "SG", "SF", "PF", "C")
+
+# HashtagBasketball short forms → canonical NBA abbreviation.
+# Everything else already matches the canonical form.
+_ALIAS = {"GS": "GSW", "NO": "NOP", "NY": "NYK", "SA": "SAS"}
+
+CANONICAL_TEAMS = frozenset({
+    "ATL", "BOS", "BKN", "CHA", "CHI", "CLE", "DAL", "DEN", "DET", "GSW",
+    "HOU", "IND", "LAC", "LAL", "MEM", "MIA", "MIL", "MIN", "NOP", "NYK",
+    "OKC", "ORL", "PHI", "PHX", "POR", "SAC", "SAS", "TOR", "UTA", "WAS"
+})
+
+
+def canonical_team(abbr):
+    """Map an alias like 'GS' or 'NO' to its canonical NBA abbreviation."""
+    return _ALIAS.get(abbr, abbr)
 
 
 # ------------------------------------------------------
@@ -49,10 +72,9 @@ def _fetch_dvp_from_hashtag():
     """
     print("[DVP] 🔄 Fetching DvP from HashtagBasketball HTML...")
 
-    # Initialize nested dict structure
-    all_teams = set(TEAM_MAP.values())
-    dvp = {abbr: {pos: {} for pos in ["PG", "SG", "SF", "PF", "C"]}
-           for abbr in all_teams}
+    # Initialize nested dict structure — one entry per canonical team
+    dvp = {abbr: {pos: {} for pos in POSITIONS}
+           for abbr in CANONICAL_TEAMS}
 
     # Map of our stat names to column names in the table
     stat_columns = {
@@ -69,33 +91,23 @@ def _fetch_dvp_from_hashtag():
     try:
         # Fetch the page (we can get all stats from one page)
         print(f"[DVP]   Fetching from {HASHTAG_URL}")
-        response = requests.get(HASHTAG_URL, headers=headers, timeout=15)
+        response = SESSION.get(HASHTAG_URL, headers=headers, timeout=15)
         response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Find all tables
-        tables = soup.find_all('table')
+
+        # Parse every table in one lxml pass — no per-table
+        # stringify/re-parse round trip
+        try:
+            tables = pd.read_html(StringIO(response.text), flavor="lxml")
+        except ValueError:
+            tables = []
         print(f"[DVP]   Found {len(tables)} tables")
-        
-        # We want the largest table (should be 150 rows for all team-position combos)
-        target_table = None
-        max_rows = 0
-        
-        for table in tables:
-            try:
-                df = pd.read_html(StringIO(str(table)))[0]
-                if len(df) > max_rows:
-                    max_rows = len(df)
-                    target_table = df
-            except:
-                continue
-        
-        if target_table is None:
+
+        if not tables:
             print("[DVP] ❌ Could not find data table")
             return dvp
-        
-        df = target_table
+
+        # We want the largest table (should be 150 rows for all team-position combos)
+        df = max(tables, key=len)
         print(f"[DVP]   Processing table with {len(df)} rows")
         
         # Clean column names
@@ -109,53 +121,27 @@ def _fetch_dvp_from_hashtag():
             print(f"[DVP] ❌ Missing required columns. Found: {list(df.columns)}")
             return dvp
         
-        # Process each row
-        for idx, row in df.iterrows():
-            try:
-                position = str(row[pos_col]).strip().upper()
-                team_raw = str(row[team_col]).strip().upper()
-                
-                # Extract team abbreviation (might have numbers after it)
-                # e.g., "NY 3" -> "NY"
-                team_abbr = ''.join(c for c in team_raw.split()[0] if c.isalpha())
-                
-                # Map to standard abbreviation
-                team_abbr = TEAM_MAP.get(team_abbr, team_abbr)
-                
-                # Validate position
-                if position not in ["PG", "SG", "SF", "PF", "C"]:
-                    continue
-                
-                if team_abbr not in dvp:
-                    continue
-                
-                # Extract rank values for each stat
-                for stat_key, col_name in stat_columns.items():
-                    if col_name in df.columns:
-                        try:
-                            # The value might be like "15.6 1" where the number after space is the rank
-                            # Or it might just be a rank number
-                            value_str = str(row[col_name]).strip()
-                            
-                            # Try to extract rank (typically the last number, or first if it's just rank)
-                            parts = value_str.split()
-                            
-                            # If there are multiple numbers, the last one is usually the rank
-                            # If just one number, it could be either value or rank
-                            if len(parts) >= 2:
-                                # Format like "15.6 1" - last number is rank
-                                rank = float(parts[-1])
-                            else:
-                                # Single number - try to parse it
-                                rank = float(parts[0])
-                            
-                            dvp[team_abbr][position][stat_key] = rank
-                            
-                        except (ValueError, IndexError):
-                            pass
-            
-            except Exception as e:
-                continue
+        # Clean position/team and pull the trailing rank out of every stat
+        # column as whole-Series string ops, then build the nested dict in
+        # one itertuples pass — no per-cell Python cleanup
+        df["pos"] = df[pos_col].astype(str).str.strip().str.upper()
+        team = df[team_col].astype(str).str.strip().str.upper().str.extract(r"^([A-Z]+)", expand=False)
+        df["team"] = team.map(_ALIAS).fillna(team)
+
+        present_stats = []
+        for stat_key, col_name in stat_columns.items():
+            if col_name in df.columns:
+                df[stat_key] = df[col_name].astype(str).str.extract(_RANK_RE, expand=False).astype(float)
+                present_stats.append(stat_key)
+
+        df = df[df["pos"].isin(POSITIONS) & df["team"].isin(CANONICAL_TEAMS)]
+
+        for row in df[["team", "pos"] + present_stats].itertuples(index=False):
+            slot = dvp[row.team][row.pos]
+            for stat_key in present_stats:
+                rank = getattr(row, stat_key)
+                if pd.notna(rank):
+                    slot[stat_key] = rank
         
         # Count successful extractions
         total_entries = sum(
@@ -185,9 +171,9 @@ def _load_cache():
     try:
         age = (time.time() - os.path.getmtime(CACHE_FILE)) / 3600
         if age < CACHE_HOURS:
-            with open(CACHE_FILE, "r") as f:
+            with open(CACHE_FILE, "rb") as f:
                 print(f"[DVP] 🟢 Using cached DvP ({age:.1f}h old)")
-                return json.load(f)["dvp"]
+                return pickle.load(f)["dvp"]
     except Exception as e:
         print(f"[DVP] ⚠️ Cache load error: {e}")
         pass
@@ -197,8 +183,8 @@ def _load_cache():
 
 def _save_cache(dvp):
     os.makedirs("data", exist_ok=True)
-    with open(CACHE_FILE, "w") as f:
-        json.dump({"timestamp": time.time(), "dvp": dvp}, f, indent=2)
+    with open(CACHE_FILE, "wb") as f:
+        pickle.dump({"timestamp": time.time(), "dvp": dvp}, f, protocol=pickle.HIGHEST_PROTOCOL)
     print("[DVP] 💾 Saved DvP cache.")
 
 
@@ -253,7 +239,7 @@ if __name__ == "__main__":
         for sample_team in ["NYK", "GSW", "LAL"][:3]:
             if sample_team in dvp_data:
                 print(f"\n{sample_team}:")
-                for pos in ["PG", "SG", "SF", "PF", "C"]:
+                for pos in POSITIONS:
                     if dvp_data[sample_team][pos]:
                         print(f"  {pos}: {dvp_data[sample_team][pos]}")
                 break
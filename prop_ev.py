@@ -3,19 +3,64 @@
 # L20-weighted projection + FantasyPros DvP + Auto position + Manual odds entry
 
 import requests
+import orjson
+import lxml.html
 import pandas as pd
 import numpy as np
-from scipy.stats import norm
-import os, json, time
+import os, re, json, math, time
+from io import StringIO
 from datetime import datetime, timezone
-from dvp_updater import load_dvp_data
+from functools import cache, lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from dvp_updater import load_dvp_data, canonical_team
+
+# Pooled session shared by every outbound call — keep-alive sockets skip
+# the per-request TCP/TLS handshake and transient 429/5xx responses retry
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3,
+                      status_forcelist=[429, 500, 502, 503, 504]),
+))
+SESSION.headers.update({
+    "User-Agent": "Mozilla/5.0",
+    "Accept-Language": "en-US,en;q=0.9",
+})
+
+# Compiled once; used to slugify player names for ESPN URLs
+_NAME_RE = re.compile(r"[a-zA-Z]+")
+
+# Directories already ensured this process — skips the repeated
+# makedirs syscall on every fetch
+_ENSURED_DIRS = set()
+
+
+def _ensure_dir(path):
+    if path not in _ENSURED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _ENSURED_DIRS.add(path)
 
 dvp_data = load_dvp_data()
 
+# Flattened once at import: one hash lookup per grade instead of three
+# nested .get() calls
+DVP_FLAT = {
+    (t.upper(), p.upper(), s.upper()): rank
+    for t, pos_d in dvp_data.items()
+    for p, stat_d in pos_d.items()
+    for s, rank in stat_d.items()
+}
+
 # ===============================
 # CONFIG
 # ===============================
+@cache
 def load_settings():
+    # Memoized: settings.json is read (and the data dir ensured) once per
+    # process instead of on every analyze call
     default = {
         "default_sportsbook": "Fliff",
         "default_region": "us",
@@ -39,7 +84,7 @@ def load_settings():
         if k not in settings:
             settings[k] = v
 
-    os.makedirs(settings["data_path"], exist_ok=True)
+    _ensure_dir(settings["data_path"])
     return settings
 
 
@@ -59,19 +104,59 @@ def ev_sportsbook(p, odds):
 # ===============================
 # INJURY STATUS
 # ===============================
-def get_injury_status(player_name, api_key):
-    if not api_key or "YOUR_SPORTSDATAIO_KEY" in api_key:
-        return None
+_INJURY_CACHE = {"key": None, "by_name": None}
+
+
+def _load_injury_table(api_key, cache_hours=24, save_dir="data"):
+    """Download the league player list once and index it by lowercased name."""
+    path = os.path.join(save_dir, "injury_cache.json")
+    try:
+        if os.path.exists(path) and (time.time() - os.path.getmtime(path)) / 3600 < cache_hours:
+            with open(path, "r") as f:
+                return json.load(f)
+    except Exception:
+        pass
+
     try:
         url = "https://api.sportsdata.io/v4/nba/scores/json/Players"
-        r = requests.get(url, headers={"Ocp-Apim-Subscription-Key": api_key}, timeout=8)
+        r = SESSION.get(url, headers={"Ocp-Apim-Subscription-Key": api_key}, timeout=8)
         if r.status_code != 200:
             return None
-        for p in r.json():
-            if player_name.lower() in p.get("Name", "").lower():
-                return p.get("InjuryStatus", None)
+        by_name = {p.get("Name", "").lower(): p.get("InjuryStatus", None) for p in orjson.loads(r.content)}
+    except Exception:
+        return None
+
+    try:
+        _ensure_dir(save_dir)
+        with open(path, "w") as f:
+            json.dump(by_name, f)
     except Exception:
+        pass
+    return by_name
+
+
+def get_injury_status(player_name, api_key):
+    if not api_key or "YOUR_SPORTSDATAIO_KEY" in api_key:
+        return None
+
+    # One download per run (and per cache TTL on disk) indexed by name,
+    # instead of re-fetching and scanning the whole league list per call
+    if _INJURY_CACHE["key"] != api_key or _INJURY_CACHE["by_name"] is None:
+        _INJURY_CACHE["by_name"] = _load_injury_table(api_key)
+        _INJURY_CACHE["key"] = api_key
+
+    table = _INJURY_CACHE["by_name"]
+    if not table:
         return None
+
+    name = player_name.lower()
+    if name in table:
+        return table[name]
+
+    # Substring fallback mirrors the old scan, but only over the index
+    for full_name, status in table.items():
+        if name in full_name:
+            return status
     return None
 
 def _parse_min_to_float(x):
@@ -90,36 +175,131 @@ def _parse_min_to_float(x):
         return None
 
 
+def parse_min_series(s: pd.Series) -> pd.Series:
+    # Vectorized _parse_min_to_float: one str.split over the whole column
+    # handles "MM:SS" entries, everything else goes through to_numeric
+    out = pd.to_numeric(s, errors="coerce")
+    sp = s.astype(str).str.split(":", expand=True)
+    if sp.shape[1] > 1:
+        has_colon = sp[1].notna()
+        out.loc[has_colon] = (
+            pd.to_numeric(sp.loc[has_colon, 0], errors="coerce")
+            + pd.to_numeric(sp.loc[has_colon, 1], errors="coerce") / 60.0
+        )
+    return out
+
+
+# ===============================
+# BALLDON'TLIE PLAYER LOOKUP (shared + cached)
+# ===============================
+_BDL_PLAYER_CACHE = {}
+
+
+def _bdl_get_player(player_name, save_dir="data", cache_hours=24):
+    """
+    Search BallDon'tLie for a player once and cache the record so the
+    logs/position/schedule paths don't each repeat the same round-trip.
+    Persists to data/bdl_players.json so reruns within the TTL skip the
+    network entirely. Returns the raw player record or None.
+    """
+    key = player_name.lower().strip()
+    if key in _BDL_PLAYER_CACHE:
+        return _BDL_PLAYER_CACHE[key]
+
+    path = os.path.join(save_dir, "bdl_players.json")
+    try:
+        if os.path.exists(path) and (time.time() - os.path.getmtime(path)) / 3600 < cache_hours:
+            with open(path, "r") as f:
+                stored = json.load(f)
+            if key in stored:
+                _BDL_PLAYER_CACHE[key] = stored[key]
+                return stored[key]
+    except Exception:
+        pass
+
+    try:
+        url = f"https://api.balldontlie.io/v2/players?search={player_name}"
+        r = SESSION.get(url, timeout=10)
+        r.raise_for_status()
+        data = orjson.loads(r.content).get("data", [])
+        record = data[0] if data else None
+    except Exception as e:
+        print(f"[BDL] ⚠️ Player search failed for {player_name}: {e}")
+        return None
+
+    if record is not None:
+        _BDL_PLAYER_CACHE[key] = record
+        try:
+            _ensure_dir(save_dir)
+            stored = {}
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    stored = json.load(f)
+            stored[key] = record
+            with open(path, "w") as f:
+                json.dump(stored, f)
+        except Exception:
+            pass
+
+    return record
+
+
 # ===============================
 # PLAYER LOGS FETCHER (BallDon'tLie + ESPN + BBRef)
 # ===============================
+def _read_html_table(url, xpath):
+    """
+    Fetch a page once and parse only the targeted game-log table instead
+    of letting pd.read_html build a DataFrame for every table on the page.
+    """
+    content = SESSION.get(url, timeout=15).content
+    doc = lxml.html.fromstring(content)
+    nodes = doc.xpath(xpath)
+    if nodes:
+        return pd.read_html(StringIO(lxml.html.tostring(nodes[0], encoding="unicode")))[0]
+    # Fallback: largest table on the (already fetched) page
+    tables = pd.read_html(StringIO(lxml.html.tostring(doc, encoding="unicode")))
+    return max(tables, key=lambda t: t.shape[0] * t.shape[1])
+
+
+def _bdl_games_to_df(games):
+    """
+    Build the 6-column log frame straight from BallDon'tLie records.
+
+    json_normalize walked every nested key of every record just so we
+    could throw away all but these columns; pulling them directly keeps
+    the cost proportional to what we keep.
+    """
+    df = pd.DataFrame({
+        "DATE": [g["game"]["date"] for g in games],
+        "PTS": [g["pts"] for g in games],
+        "REB": [g["reb"] for g in games],
+        "AST": [g["ast"] for g in games],
+        "FG3M": [g["fg3m"] for g in games],
+        "MIN": [g["min"] for g in games],
+    })
+    df["DATE"] = pd.to_datetime(df["DATE"]).dt.date
+    return df
+
+
 def fetch_player_logs(player_name, save_dir="data"):
-    import re
-    os.makedirs(save_dir, exist_ok=True)
-    headers = {"User-Agent": "Mozilla/5.0", "Accept-Language": "en-US,en;q=0.9"}
+    _ensure_dir(save_dir)
 
     # 1️⃣ BallDon'tLie v2
     try:
-        search_url = f"https://api.balldontlie.io/v2/players?search={player_name}"
-        res = requests.get(search_url, headers=headers, timeout=10)
-        res.raise_for_status()
-        players = res.json().get("data", [])
-        if not players:
+        record = _bdl_get_player(player_name, save_dir=save_dir)
+        if not record:
             raise Exception("Player not found")
-        player_id = players[0]["id"]
+        player_id = record["id"]
 
         stats_url = f"https://api.balldontlie.io/v2/stats?player_ids[]={player_id}&per_page=100"
-        r = requests.get(stats_url, headers=headers, timeout=10)
+        r = SESSION.get(stats_url, timeout=10)
         r.raise_for_status()
-        games = r.json().get("data", [])
+        games = orjson.loads(r.content).get("data", [])
         if not games:
             raise Exception("No games")
 
-        df = pd.json_normalize(games)
-        keep = ["game.date", "pts", "reb", "ast", "fg3m", "min"]
-        df = df[keep]
-        df.columns = ["DATE", "PTS", "REB", "AST", "FG3M", "MIN"]
-        df["DATE"] = pd.to_datetime(df["DATE"]).dt.date
+        df = _bdl_games_to_df(games)
         path = os.path.join(save_dir, f"{player_name.replace(' ', '_')}.csv")
         df.to_csv(path, index=False)
         print(f"[Logs] ✅ Saved {len(df)} logs for {player_name} → {path}")
@@ -130,10 +310,9 @@ def fetch_player_logs(player_name, save_dir="data"):
 
     # 2️⃣ ESPN backup
     try:
-        name_slug = "-".join(re.findall(r"[a-zA-Z]+", player_name.lower()))
+        name_slug = "-".join(_NAME_RE.findall(player_name.lower()))
         url = f"https://www.espn.com/nba/player/gamelog/_/id/{name_slug}"
-        tables = pd.read_html(url)
-        df = max(tables, key=lambda t: t.shape[0] * t.shape[1])
+        df = _read_html_table(url, '//table[contains(@class, "Table")]')
         df.columns = [c.upper() for c in df.columns]
         rename_map = {"PTS": "PTS", "REB": "REB", "AST": "AST", "3PM": "FG3M", "MIN": "MIN"}
         df = df.rename(columns=rename_map)
@@ -151,12 +330,14 @@ def fetch_player_logs(player_name, save_dir="data"):
         first = player_name.split()[0].lower()
         bbref_stub = last[:5] + first[:2] + "01"
         url = f"https://www.basketball-reference.com/players/{last[0]}/{bbref_stub}/gamelog/2025"
-        tables = pd.read_html(url)
-        df = max(tables, key=lambda t: t.shape[0] * t.shape[1])
+        df = _read_html_table(url, '//table[@id="pgl_basic"]')
         df.columns = [str(c).upper() for c in df.columns]
         df = df.rename(columns={"PTS": "PTS", "TRB": "REB", "AST": "AST", "3P": "FG3M", "MP": "MIN"})
         df = df[[c for c in ["PTS", "REB", "AST", "FG3M", "MIN"] if c in df.columns]]
-        df = df.apply(pd.to_numeric, errors="coerce").fillna(0)
+        # Column-wise to_numeric — same coercion without apply's dispatch
+        for c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce")
+        df = df.fillna(0)
         df = df[df["REB"] < 20]  # sanity cap to avoid broken tables
         path = os.path.join(save_dir, f"{player_name.replace(' ', '_')}.csv")
         df.to_csv(path, index=False)
@@ -169,68 +350,156 @@ def fetch_player_logs(player_name, save_dir="data"):
     return None
 
 
+def fetch_player_logs_incremental(player_name, since, save_dir="data"):
+    """
+    Append only games played after `since` to the cached CSV.
+
+    A stale cache usually trails the season by 0–3 games, so we ask
+    BallDon'tLie for games from since+1 on instead of re-downloading the
+    full history. Returns the combined DataFrame, or None on any failure
+    so the caller can fall back to a full fetch_player_logs run.
+    """
+    try:
+        record = _bdl_get_player(player_name, save_dir=save_dir)
+        if not record:
+            return None
+        player_id = record["id"]
+
+        start = (pd.to_datetime(since) + pd.Timedelta(days=1)).date()
+        stats_url = (f"https://api.balldontlie.io/v2/stats?player_ids[]={player_id}"
+                     f"&per_page=100&start_date={start.isoformat()}")
+        r = SESSION.get(stats_url, timeout=10)
+        r.raise_for_status()
+        games = orjson.loads(r.content).get("data", [])
+
+        path = os.path.join(save_dir, f"{player_name.replace(' ', '_')}.csv")
+        old = pd.read_csv(path)
+        old["DATE"] = pd.to_datetime(old["DATE"]).dt.date
+
+        if games:
+            new = _bdl_games_to_df(games)
+            df = pd.concat([old, new]).drop_duplicates("DATE")
+        else:
+            df = old
+
+        # Rewriting the CSV refreshes its mtime, so "no new games" still
+        # counts as a refresh for the 24h check
+        df.to_csv(path, index=False)
+        print(f"[Logs] ✅ Appended {len(games)} new game(s) for {player_name} → {path}")
+        return df
+    except Exception as e:
+        print(f"[Logs] ⚠️ Incremental update failed: {e}")
+        return None
+
+
 
 # ===============================
 # L20-WEIGHTED MODEL
 # ===============================
-def l20_weighted_mean(vals: pd.Series) -> float:
-    if len(vals) == 0:
+def l20_weighted_mean(vals: np.ndarray) -> float:
+    arr = np.nan_to_num(np.asarray(vals, dtype=np.float64))
+    if arr.size == 0:
         return 0.0
-    season_mean = float(pd.to_numeric(vals, errors="coerce").fillna(0).mean())
-    last20 = pd.to_numeric(vals.tail(20), errors="coerce").fillna(0)
-    l20_mean = float(last20.mean()) if len(last20) > 0 else season_mean
+    season_mean = float(arr.mean())
+    l20_mean = float(arr[-20:].mean())
     return 0.60 * l20_mean + 0.40 * season_mean
 
 
-def grade_probabilities(df, stat_col, line, proj_mins, avg_mins, injury_status=None, dvp_mult=1.0):
-    if stat_col not in df.columns:
-        if stat_col == "REB+AST":
-            df["REB+AST"] = df["REB"] + df["AST"]
-        elif stat_col == "PRA":
-            df["PRA"] = df["PTS"] + df["REB"] + df["AST"]
-        else:
-            raise KeyError(f"Missing stat {stat_col}")
+def _grade_core(vals, line, ratio, inj_mult, dvp_mult):
+    """
+    Numeric core of grade_probabilities over a float64 array — pure
+    ndarray/math ops so a batch path can call it per stat without any
+    pandas work in the loop.
+    """
+    n = vals.size
+    std = vals.std() if n > 1 else 1.0
+    mean = l20_weighted_mean(vals) * ratio * inj_mult * dvp_mult
 
-    vals = pd.to_numeric(df[stat_col], errors="coerce").fillna(0.0)
-    n = len(vals)
-    std = float(vals.std(ddof=0)) if n > 1 else 1.0
-    mean = l20_weighted_mean(vals)
-    mean *= (proj_mins / avg_mins) if avg_mins > 0 else 1.0
-    if injury_status and str(injury_status).lower() not in ["active", "probable"]:
-        mean *= 0.9
-    mean *= float(dvp_mult)
+    if std > 0:
+        # 0.5*(1+erf(z/√2)) is the normal CDF as a single scalar C call
+        p_norm = 0.5 * (1.0 + math.erf((mean - line) / (std * math.sqrt(2.0))))
+    else:
+        p_norm = float(mean > line)
+    p_emp = (vals > line).mean() if n > 0 else 0.5
+    return 0.8 * p_norm + 0.2 * p_emp, mean
+
+
+def _extract_stat(df, stat_col):
+    """
+    Stat values as a contiguous float64 ndarray. Derived stats
+    (REB+AST, PRA) are summed in NumPy on the fly — no new pandas
+    column, no index alignment, and the caller's frame is never mutated.
+    """
+    def col(name):
+        return pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=np.float64, na_value=0.0)
+
+    if stat_col in df.columns:
+        return col(stat_col)
+    if stat_col == "REB+AST":
+        return np.add(col("REB"), col("AST"))
+    if stat_col == "PRA":
+        return col("PTS") + col("REB") + col("AST")
+    raise KeyError(f"Missing stat {stat_col}")
+
+
+def grade_all_stats(df, lines, proj_mins, avg_mins, injury_status=None, dvp_mults=None):
+    """
+    Grade several stats for one player's log frame in a single pass.
+
+    `lines` maps stat name → prop line; `dvp_mults` optionally maps stat
+    name → DvP multiplier. The base columns are pulled into float64
+    arrays once and REB+AST / PRA derived by vectorized addition, so each
+    stat after the first only costs one _grade_core call — no repeated
+    to_numeric/extraction work per stat.
+
+    Returns {stat: (p_final, n_games, mean)} — the same tuple
+    grade_probabilities yields for a single stat.
+    """
+    dvp_mults = dvp_mults or {}
+
+    base = {}
+    for c in ("PTS", "REB", "AST", "FG3M"):
+        if c in df.columns:
+            base[c] = pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=np.float64, na_value=0.0)
+    if "REB" in base and "AST" in base:
+        base["REB+AST"] = base["REB"] + base["AST"]
+        if "PTS" in base:
+            base["PRA"] = base["PTS"] + base["REB+AST"]
+
+    ratio = (proj_mins / avg_mins) if avg_mins > 0 else 1.0
+    inj_mult = 0.9 if injury_status and str(injury_status).lower() not in ["active", "probable"] else 1.0
+
+    results = {}
+    for stat_col, line in lines.items():
+        vals = base.get(stat_col)
+        if vals is None:
+            print(f"[Model] ⚠️ Skipping {stat_col}: column not in logs")
+            continue
+        p_final, mean = _grade_core(vals, line, ratio, inj_mult, float(dvp_mults.get(stat_col, 1.0)))
+        results[stat_col] = (p_final, vals.size, mean)
+    return results
 
-    print(f"[Model] DvP applied: {dvp_mult:.3f} | Adjusted mean → {mean:.2f}")
 
-    p_norm = 1 - norm.cdf(line, mean, std)
-    p_emp = float(np.mean(vals > line)) if n > 0 else 0.5
-    p_final = 0.8 * p_norm + 0.2 * p_emp
-    return p_final, n, mean
+def grade_probabilities(df, stat_col, line, proj_mins, avg_mins, injury_status=None, dvp_mult=1.0):
+    vals = _extract_stat(df, stat_col)
+    ratio = (proj_mins / avg_mins) if avg_mins > 0 else 1.0
+    inj_mult = 0.9 if injury_status and str(injury_status).lower() not in ["active", "probable"] else 1.0
+
+    p_final, mean = _grade_core(vals, line, ratio, inj_mult, float(dvp_mult))
+    print(f"[Model] DvP applied: {dvp_mult:.3f} | Adjusted mean → {mean:.2f}")
+    return p_final, vals.size, mean
 
 
 # ===============================
 # POSITION DETECTION
 # ===============================
-def _bdl_headers():
-    return {
-        "User-Agent": "Mozilla/5.0",
-        "Accept-Language": "en-US,en;q=0.9"
-    }
-
 def get_player_position_auto(player_name, df_logs=None):
-    headers = _bdl_headers()
-    try:
-        url = f"https://api.balldontlie.io/v2/players?search={player_name}"
-        r = requests.get(url, headers=headers, timeout=10)
-        r.raise_for_status()
-        data = r.json().get("data", [])
-        if data:
-            pos = (data[0].get("position") or "").strip().upper()
-            if pos in ["PG","SG","SF","PF","C"]:
-                print(f"[Position] Pulled from BallDon'tLie: {pos}")
-                return pos
-    except Exception as e:
-        print(f"[Position] ⚠️ BallDon'tLie lookup failed: {e}")
+    record = _bdl_get_player(player_name)
+    if record:
+        pos = (record.get("position") or "").strip().upper()
+        if pos in ["PG","SG","SF","PF","C"]:
+            print(f"[Position] Pulled from BallDon'tLie: {pos}")
+            return pos
 
     def avg(col):
         if df_logs is None or col not in df_logs.columns:
@@ -250,38 +519,27 @@ def get_player_position_auto(player_name, df_logs=None):
 # UPCOMING OPPONENT DETECTION (BallDon'tLie)
 # ===============================
 def get_upcoming_opponent_abbr(player_name):
-    headers = _bdl_headers()
     try:
-        pr = requests.get(f"https://api.balldontlie.io/v2/players?search={player_name}",
-                          headers=headers, timeout=10)
-        pr.raise_for_status()
-        pdata = pr.json().get("data", [])
-        if not pdata:
+        record = _bdl_get_player(player_name)
+        if not record:
             return None
-        team = pdata[0].get("team") or {}
+        team = record.get("team") or {}
         team_id = team.get("id")
         if not team_id:
             return None
 
         today = datetime.now(timezone.utc)
         year = today.year if today.month >= 10 else today.year - 1
+        today_d = today.date()
 
-        games = []
-        page = 1
-        while True:
-            gurl = (f"https://api.balldontlie.io/v2/games?"
-                    f"team_ids[]={team_id}&seasons[]={year}&per_page=100&page={page}&postseason=false")
-            gr = requests.get(gurl, headers=headers, timeout=10)
-            gr.raise_for_status()
-            payload = gr.json()
-            batch = payload.get("data", [])
-            if not batch:
-                break
-            games.extend(batch)
-            if len(batch) < 100:
-                break
-            page += 1
-
+        # start_date makes the API return only games from today on, so a
+        # single small page holds the next game — no full-season scan
+        gurl = (f"https://api.balldontlie.io/v2/games?"
+                f"team_ids[]={team_id}&seasons[]={year}&per_page=5"
+                f"&start_date={today_d.isoformat()}&postseason=false")
+        gr = SESSION.get(gurl, timeout=10)
+        gr.raise_for_status()
+        games = orjson.loads(gr.content).get("data", [])
         if not games:
             return None
 
@@ -291,7 +549,6 @@ def get_upcoming_opponent_abbr(player_name):
             except Exception:
                 return None
 
-        today_d = today.date()
         future = [(to_date(g.get("date", "")), g) for g in games]
         future = [(d, g) for (d, g) in future if d and d >= today_d]
         if not future:
@@ -312,85 +569,191 @@ def get_upcoming_opponent_abbr(player_name):
 # ===============================
 # DvP MULTIPLIER
 # ===============================
-def get_dvp_multiplier(opponent_abbr, position, stat_key):
-    try:
-        if not opponent_abbr or not position or not stat_key:
-            return 1.0
-        team_dict = dvp_data.get(opponent_abbr.upper(), {})
-        pos_dict  = team_dict.get(position.upper(), {})
-        rank      = pos_dict.get(stat_key.upper(), None)
-        if rank is None:
-            return 1.0
-        return 1.1 - (rank - 1) / 300
-    except Exception:
+def get_dvp_multiplier(opponent_abbr, position, stat_key, dvp=None):
+    if not opponent_abbr or not position or not stat_key:
+        return 1.0
+    team = canonical_team(opponent_abbr.upper())
+    if dvp is None:
+        rank = DVP_FLAT.get((team, position.upper(), stat_key.upper()))
+    else:
+        # Caller-supplied DvP (e.g. Streamlit's cached copy) stays nested
+        rank = dvp.get(team, {}).get(position.upper(), {}).get(stat_key.upper())
+    if rank is None:
         return 1.0
+    return 1.1 - (rank - 1) / 300
 
 
 # ===============================
-# MAIN
+# SINGLE-PROP ANALYZER
 # ===============================
-def main():
-    settings = load_settings()
-    print("🧠 PropPulse+ Model v2025.3 — Player Prop EV Analyzer")
-    print("==============================\n")
-
-    player = input("Player name: ").strip()
-    stat = input("Stat (PTS / REB / AST / REB+AST / PRA / FG3M): ").strip().upper()
-    line = float(input("Line: "))
-    odds = int(input("Sportsbook odds (e.g. -110): "))
+# Cached game-log schema: only these columns are read back, with compact
+# numeric dtypes so pandas skips its type-sniffing pass. MIN stays
+# untyped because some sources store it as "MM:SS".
+LOG_COLUMNS = ("DATE", "PTS", "REB", "AST", "FG3M", "MIN")
+LOG_DTYPES = {"PTS": "float32", "REB": "float32", "AST": "float32", "FG3M": "float32"}
+
+def analyze_single_prop(player, stat, line, odds, settings=None, dvp=None, debug_mode=True):
+    """
+    Run the full model pipeline for one prop and return structured results.
+
+    Returns a dict with projection, p_model, p_book, ev, confidence, grade,
+    result, opponent, direction, dvp_mult and n_games — or None if game
+    logs could not be fetched or the model failed.
+    """
+    if settings is None:
+        settings = load_settings()
 
     path = os.path.join(settings["data_path"], f"{player.replace(' ', '_')}.csv")
-    need_refresh = not os.path.exists(path) or (time.time() - os.path.getmtime(path))/3600 > 24
+    # One stat syscall covers both existence and age, and the TTL honors
+    # the configurable cache_hours instead of a hard-coded 24
+    try:
+        mtime = os.stat(path).st_mtime
+    except FileNotFoundError:
+        mtime = None
+    need_refresh = mtime is None or (time.time() - mtime) / 3600 > settings.get("cache_hours", 24)
 
     if need_refresh:
-        print(f"[Data] ⏳ Refreshing logs for {player}...")
-        df = fetch_player_logs(player, save_dir=settings["data_path"])
+        if debug_mode:
+            print(f"[Data] ⏳ Refreshing logs for {player}...")
+        df = None
+        if mtime is not None:
+            # Stale cache: only pull games newer than what we already have
+            try:
+                last = pd.read_csv(path, usecols=["DATE"])["DATE"].max()
+            except Exception:
+                last = None
+            if pd.notna(last):
+                df = fetch_player_logs_incremental(player, since=last, save_dir=settings["data_path"])
+        if df is None:
+            df = fetch_player_logs(player, save_dir=settings["data_path"])
         if df is None:
             print(f"[Logs] ❌ Could not fetch logs for {player}.")
-            return
+            return None
     else:
-        df = pd.read_csv(path)
-        print(f"[Data] Loaded {len(df)} games from {path}")
+        try:
+            df = pd.read_csv(path, usecols=lambda c: c in LOG_COLUMNS, dtype=LOG_DTYPES)
+        except (ValueError, TypeError):
+            # Odd cached schema (e.g. an old export) — let pandas sniff
+            df = pd.read_csv(path)
+        if debug_mode:
+            print(f"[Data] Loaded {len(df)} games from {path}")
 
     if "MIN" in df.columns:
-        df["MIN"] = pd.to_numeric(df["MIN"], errors="coerce").fillna(0)
+        df["MIN"] = parse_min_series(df["MIN"]).fillna(0)
         avg_mins = df["MIN"].mean() if len(df["MIN"]) > 0 else 30
     else:
         avg_mins = 30
     proj_mins = avg_mins
 
-    inj = get_injury_status(player, settings.get("injury_api_key"))
-    print(f"[Injury] {player} status: {inj or 'Healthy ✅'}")
-
-    pos = get_player_position_auto(player, df_logs=df)
-    print(f"[Position] Auto-detected: {pos}")
-
-    opp = get_upcoming_opponent_abbr(player)
-    if opp:
-        print(f"[Schedule] Upcoming opponent auto-detected: {opp}")
-    else:
-        print("[Schedule] Could not auto-detect opponent; using neutral DvP (1.00).")
+    # Injury, position, and opponent lookups have no data dependency on
+    # each other — run them concurrently so the block costs max(latency)
+    # instead of the sum
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        f_inj = ex.submit(get_injury_status, player, settings.get("injury_api_key"))
+        f_pos = ex.submit(get_player_position_auto, player, df)
+        f_opp = ex.submit(get_upcoming_opponent_abbr, player)
+        inj = f_inj.result()
+        pos = f_pos.result()
+        opp = f_opp.result()
+
+    if debug_mode:
+        print(f"[Injury] {player} status: {inj or 'Healthy ✅'}")
+        print(f"[Position] Auto-detected: {pos}")
+        if opp:
+            print(f"[Schedule] Upcoming opponent auto-detected: {opp}")
+        else:
+            print("[Schedule] Could not auto-detect opponent; using neutral DvP (1.00).")
 
-    dvp_mult = get_dvp_multiplier(opp, pos, stat) if opp else 1.0
-    print(f"[DvP] {opp or 'N/A'} vs {pos} on {stat} → multiplier {dvp_mult:.3f}")
+    dvp_mult = get_dvp_multiplier(opp, pos, stat, dvp=dvp) if opp else 1.0
+    if debug_mode:
+        print(f"[DvP] {opp or 'N/A'} vs {pos} on {stat} → multiplier {dvp_mult:.3f}")
 
     try:
         p_model, n_games, proj_stat = grade_probabilities(df, stat, line, proj_mins, avg_mins, inj, dvp_mult)
     except Exception as e:
         print(f"[Model] Error: {e}")
-        return
+        return None
 
     p_book = american_to_prob(odds)
     ev = ev_sportsbook(p_model, odds)
 
+    if ev >= 0.10:
+        grade = "A"
+    elif ev >= 0.05:
+        grade = "B"
+    elif ev > 0:
+        grade = "C"
+    else:
+        grade = "D"
+
+    return {
+        "player": player,
+        "stat": stat,
+        "line": line,
+        "odds": odds,
+        "projection": proj_stat,
+        "p_model": p_model,
+        "p_book": p_book,
+        "ev": ev,
+        "confidence": abs(p_model - 0.5) * 2,
+        "grade": grade,
+        "result": "🔥" if ev > 0 else "⚠️",
+        "opponent": opp or "N/A",
+        "direction": "OVER" if proj_stat > line else "UNDER",
+        "dvp_mult": dvp_mult,
+        "n_games": n_games,
+    }
+
+
+@lru_cache(maxsize=2048)
+def _analyze_cached(player, stat, line, odds, settings_items, hour_bucket):
+    # hour_bucket is part of the key purely to expire entries hourly
+    return analyze_single_prop(player, stat, line, odds, dict(settings_items), debug_mode=False)
+
+
+def analyze_single_prop_cached(player, stat, line, odds, settings=None):
+    """
+    Memoized analyze_single_prop with a ~1h TTL.
+
+    Repeat lookups for the same (player, stat, line, odds) — alt lines
+    that survived dedup, or a user retrying with different odds tabs —
+    return instantly instead of redoing the log/DvP/projection work.
+    """
+    if settings is None:
+        settings = load_settings()
+    settings_items = tuple(sorted(settings.items()))
+    hour_bucket = int(time.time() // 3600)
+    return _analyze_cached(player, stat, float(line), int(odds), settings_items, hour_bucket)
+
+
+# ===============================
+# MAIN
+# ===============================
+def main(settings=None, dvp=None):
+    # Callers (e.g. the Streamlit app) can pass pre-loaded settings/DvP
+    # so a rerun doesn't hit the disk or network again.
+    if settings is None:
+        settings = load_settings()
+    print("🧠 PropPulse+ Model v2025.3 — Player Prop EV Analyzer")
+    print("==============================\n")
+
+    player = input("Player name: ").strip()
+    stat = input("Stat (PTS / REB / AST / REB+AST / PRA / FG3M): ").strip().upper()
+    line = float(input("Line: "))
+    odds = int(input("Sportsbook odds (e.g. -110): "))
+
+    res = analyze_single_prop(player, stat, line, odds, settings, dvp=dvp)
+    if res is None:
+        return
+
     print("\n==============================")
     print(f"📊 {player} | {stat} Line {line}")
-    print(f"Games Analyzed: {n_games}")
-    print(f"Model Prob:  {p_model*100:.1f}%")
-    print(f"Book Prob:   {p_book*100:.1f}%")
-    print(f"Model Projection: {proj_stat:.1f} {stat}")
-    print(f"EV:          {ev*100:.1f}¢ per $1 | {'🔥 Positive' if ev > 0 else '⚠️ Negative'}")
-    if proj_stat > line:
+    print(f"Games Analyzed: {res['n_games']}")
+    print(f"Model Prob:  {res['p_model']*100:.1f}%")
+    print(f"Book Prob:   {res['p_book']*100:.1f}%")
+    print(f"Model Projection: {res['projection']:.1f} {stat}")
+    print(f"EV:          {res['ev']*100:.1f}¢ per $1 | {'🔥 Positive' if res['ev'] > 0 else '⚠️ Negative'}")
+    if res["direction"] == "OVER":
         print("🟢 Over Value")
     else:
         print("🔴 Under Value")